@@ -1,16 +1,31 @@
 from typing import Iterator, Iterable
 from base64 import b64encode
 from json import dumps
-from logging import DEBUG, Formatter, Logger
-from logging.handlers import RotatingFileHandler
+from logging import DEBUG, ERROR, Formatter, Logger
+from logging.handlers import MemoryHandler, RotatingFileHandler
 from os import getenv
 from pathlib import Path
 from uuid import uuid4
+import os
 import re
 
+try:
+    import orjson
+except ImportError:  # optional speedup, stdlib json is the fallback
+    orjson = None
 
-def dump_json(data: object):
-    return dumps(data).encode()
+
+def dump_json(data: object) -> bytes:
+    if orjson:
+        return orjson.dumps(data)
+    return dumps(data, separators=(",", ":")).encode()
+
+
+def split_json(data: dict, key: str) -> tuple[bytes, bytes]:
+    """Serialized `data` split around the value of `key`"""
+    placeholder = gen_id()
+    prefix, suffix = dump_json({**data, key: placeholder}).split(dump_json(placeholder))
+    return prefix, suffix
 
 
 def base64_encode(buf):
@@ -32,25 +47,61 @@ def load_token():
     return ""
 
 
-def normalize(obj):
+def json_default(obj):
+    # Called by the encoder only for objects it can't serialize itself
     if isinstance(obj, Iterator):
         return list(obj)
-    if isinstance(obj, dict):
-        return {k: normalize(v) for k, v in obj.items()}
-    if isinstance(obj, (list, tuple)):
-        return [normalize(x) for x in obj]
-    return obj
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 
 def save_data(data: dict | Iterable, path: Path) -> Path:
     path = Path(path).with_suffix(".json")
-    tmp = path.with_suffix(".json.tmp")
-    tmp.write_text(dumps(normalize(data), indent=2, ensure_ascii=False))
-    tmp.replace(path)
+    if orjson:
+        buf = orjson.dumps(
+            data,
+            default=json_default,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+        )
+    else:
+        buf = dumps(data, default=json_default, indent=2, ensure_ascii=False).encode()
+
+    # Same directory as the target, so the final rename is atomic. Created
+    # as 0666 so the umask gives it the usual permissions
+    tmp = path.parent / f"{path.name}.{gen_id()}.tmp"
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    fd = os.open(tmp, flags, 0o666)
+    try:
+        with open(fd, "wb") as f:
+            f.write(buf)
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+    fsync_dir(path.parent)
 
     return path
 
 
+def fsync_dir(path: Path):
+    # Makes a rename inside `path` durable, skipped where directories can't
+    # be opened (windows) or synced (some network/FUSE mounts)
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
 def get_logger(
     name: str,
     log_path: Path,
@@ -65,7 +116,11 @@ def get_logger(
     )
     handler.setFormatter(Formatter(log_format, date_format))
 
+    # Debug logging is chatty, write in batches instead of once per record.
+    # Errors flush right away, the rest is flushed on exit by logging.shutdown()
+    buffered = MemoryHandler(capacity=512, flushLevel=ERROR, target=handler)
+
     logger = Logger(name, DEBUG)
-    logger.addHandler(handler)
+    logger.addHandler(buffered)
 
     return logger
@@ -1,15 +1,28 @@
 from datetime import datetime
 from typing import Iterable, Optional
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 from aiohttp import ClientResponse, ClientSession
 from pydotmap import DotMap
 
 from logic.objects import Filters, QuestType
 from logic.utils import time_format
 
+# Quest configs don't change during a run, so anything derived only from
+# them is resolved once per quest id instead of walking the DotMap again.
+_quest_types: dict[str, QuestType] = {}
+_quest_names: dict[str, str] = {}
+_quest_rewards: dict[str, tuple[str, ...]] = {}
+
 
 def get_quest_type(quest: DotMap) -> QuestType:
-    return QuestType.from_quest(quest)
+    if (quest_type := _quest_types.get(quest.id)) is None:
+        quest_type = _quest_types[quest.id] = QuestType.from_quest(quest)
+    return quest_type
 
 
 def get_quest_rewards_expires(quest: DotMap, time: bool = False, sep: str = "@") -> str:
@@ -17,7 +30,14 @@ def get_quest_rewards_expires(quest: DotMap, time: bool = False, sep: str = "@")
 
 
 def get_quest_name(quest: DotMap, quest_type: Optional[QuestType] = None) -> str:
-    quest_type = quest_type or get_quest_type(quest)
+    if (name := _quest_names.get(quest.id)) is None:
+        name = _quest_names[quest.id] = _get_quest_name(quest, quest_type)
+    return name
+
+
+def _get_quest_name(quest: DotMap, quest_type: Optional[QuestType] = None) -> str:
+    if quest_type is None:  # Achievement is 0, so no `or` here
+        quest_type = get_quest_type(quest)
     application_name = quest.config.application.name
 
     if quest_type == QuestType.Watch:
@@ -56,15 +76,16 @@ def get_quest_progress(quest: DotMap, /) -> tuple[str, int, int]:
 
 
 def get_quest_rewards(quest: DotMap) -> Iterable[str]:
-    rewards_config = quest.config.rewards_config.rewards
-    return map(
-        lambda s: str(s).title(),
-        map(lambda x: x.messages.name_with_article, rewards_config),
-    )
+    if (rewards := _quest_rewards.get(quest.id)) is None:
+        rewards_config = quest.config.rewards_config.rewards
+        rewards = _quest_rewards[quest.id] = tuple(
+            str(x.messages.name_with_article).title() for x in rewards_config
+        )
+    return rewards
 
 
 async def get_json(response: ClientResponse):
-    return await response.json()
+    return await response.json(loads=json_loads)
 
 
 async def get_quests(session: ClientSession) -> Iterable[DotMap]:
@@ -77,8 +98,9 @@ async def get_quests(session: ClientSession) -> Iterable[DotMap]:
             f"You are blocked for completing any quests until: {datetime.fromisoformat(blocked)}"
         )
 
-    excluded_quests = map(int, map(lambda x: x.id, server_response.excluded_quests))
-    return filter(lambda x: x.id not in excluded_quests, server_response.quests)
+    # Ids are compared as strings, snowflakes may come back as either type
+    excluded_quests = frozenset(str(x.id) for x in server_response.excluded_quests)
+    return filter(lambda x: str(x.id) not in excluded_quests, server_response.quests)
 
 
 async def enroll_quest(quest: DotMap, session: ClientSession) -> Optional[DotMap]:
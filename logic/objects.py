@@ -1,6 +1,5 @@
 from collections.abc import Awaitable, Callable
-from enum import Enum
-from functools import total_ordering
+from enum import IntEnum
 from typing import Optional
 
 from aiohttp import ClientSession
@@ -34,24 +33,24 @@ class Filters:
         and not time_in_past(x.config.expires_at)
     )
 
+    # Cheap status checks go first, timestamps are only parsed when needed
     Claimable: QuestFilter = lambda x: bool(
         x.user_status
-        and not time_in_past(x.config.expires_at)
         and x.user_status.completed_at
         and not x.user_status.claimed_at
         and (rea := x.config.rewards_config.rewards_expire_at)
+        and not time_in_past(x.config.expires_at)
         and not time_in_past(rea)
     )
 
     # 3, 4 => Collectable, Orbs
     Worthy: QuestFilter = lambda x: bool(
-        not time_in_past(x.config.expires_at)
-        and any(reward.type in [3, 4] for reward in x.config.rewards_config.rewards)
+        any(reward.type in (3, 4) for reward in x.config.rewards_config.rewards)
+        and not time_in_past(x.config.expires_at)
     )
 
 
-@total_ordering
-class QuestType(Enum):
+class QuestType(IntEnum):
     # Unknown => questType ∈ { progress, }
     Unknown = -1
     Achievement = 0
@@ -79,17 +78,7 @@ class QuestType(Enum):
         }
         # fmt:on
 
-        try:
-            # "WATCH_VIDEO" => ["WATCH", "VIDEO"] => "WATCH"
-            name = list(map(lambda x: x.split("_").pop(0), map(str, tasks_names))).pop(
-                0
-            )
-        except IndexError:
-            name = "Unknown"
+        # First task decides, "WATCH_VIDEO" => ["WATCH", "VIDEO"] => "WATCH"
+        name = str(next(iter(tasks_names), "Unknown")).split("_", 1)[0]
 
         return type_map.get(name.lower(), cls.Unknown)
-
-    def __lt__(self, other):
-        if not isinstance(other, QuestType):
-            return NotImplemented
-        return self.value < other.value
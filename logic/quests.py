@@ -1,8 +1,10 @@
 import asyncio
+from collections.abc import Callable
 from datetime import datetime
 import json
 import math
 import random
+import time
 from typing import Optional
 
 from aiohttp import ClientSession
@@ -18,8 +20,7 @@ from logic.objects import (
 )
 from logic.utils import (
     time_curr,
-    time_diff_now,
-    time_in_past,
+    time_parse,
 )
 from logic.helpers import (
     get_json,
@@ -29,6 +30,9 @@ from logic.helpers import (
     get_quest_progress,
 )
 
+# Jitter for heartbeats, a dedicated instance instead of the module-level one
+rng = random.Random()
+
 
 async def get_orbs_balance(session: ClientSession):
     balance = None
@@ -37,11 +41,28 @@ async def get_orbs_balance(session: ClientSession):
         "users/@me/virtual-currency/balance", raise_for_status=False
     ) as resp:
         if resp.ok and "json" in resp.content_type:
-            balance = int((await resp.json()).get("balance", "-1"))
+            balance = int((await get_json(resp)).get("balance", "-1"))
 
     return balance or -1
 
 
+def throttle_progress(
+    procCallback: ProgressCallback, seconds_done: int, seconds_needed: int
+) -> Callable[[int], None]:
+    """Reports the current progress, then at most ~100 more times per quest"""
+    step = max(1, seconds_needed // 100)
+    last_reported = seconds_done
+    procCallback(seconds_done, seconds_needed)
+
+    def report(done: int):
+        nonlocal last_reported
+        if done - last_reported >= step:
+            procCallback(done, seconds_needed)
+            last_reported = done
+
+    return report
+
+
 async def complete_video_quest(
     quest: DotMap,
     session: ClientSession,
@@ -50,62 +71,72 @@ async def complete_video_quest(
 ):
     user_status = quest.user_status
     task_name, seconds_done, seconds_needed = get_quest_progress(quest)
+    prefix = f"[{quest.id}]"  # static part of every log line
 
     max_future, speed, interval = 1e1, 7, 1
     enrolled_at = user_status.enrolled_at
+    # Parsed once, the loop only needs the wall clock offset in seconds
+    enrolled_ts = time_parse(enrolled_at).timestamp()
     completed = False
 
     perc = (seconds_done / seconds_needed) if seconds_needed else 0.0
     log(
-        f"[{quest.id}] "
+        f"{prefix} "
         f"{task_name}: {seconds_done}/{seconds_needed}s "
         f"({perc * 100:.1f}%) | "
         f"Started: {datetime.fromisoformat(enrolled_at)} | "
         f"Rewards: {','.join(get_quest_rewards(quest))}"
     )
 
+    report = throttle_progress(procCallback, seconds_done, seconds_needed)
+    # Bound once, read once per countdown step
+    loop_time = asyncio.get_running_loop().time
+
     while not completed:
-        if not time_in_past(enrolled_at):
+        elapsed = time.time() - enrolled_ts
+        if elapsed < 0:
+            await asyncio.sleep(-elapsed)
             continue
 
-        max_allowed = time_diff_now(enrolled_at).seconds + max_future
+        max_allowed = int(elapsed) + max_future
         diffrence = max_allowed - seconds_done
         next_ = seconds_done + speed
 
         if diffrence >= speed:
-            server_response = DotMap(
-                await get_json(
-                    await session.post(
-                        f"quests/{quest.id}/video-progress",
-                        json={
-                            "timestamp": min(seconds_needed, next_ + random.random())
-                        },
-                    )
+            # Plain dict, only completed_at is read from it
+            server_response = await get_json(
+                await session.post(
+                    f"quests/{quest.id}/video-progress",
+                    json={"timestamp": min(seconds_needed, next_ + rng.random())},
                 )
             )
-            completed = server_response.completed_at is not None
+            completed = server_response.get("completed_at") is not None
             seconds_done = min(seconds_needed, next_)
-            log(f"[{quest.id}] Heartbeat sent got reply: {server_response}")
+            log(f"{prefix} Heartbeat sent got reply: {server_response}")
 
-        procCallback(seconds_done, seconds_needed)
         if seconds_done >= seconds_needed:
             break
+        if diffrence < speed:
+            # Nothing was sent this tick so progress can't have moved,
+            # skip the reporting and logging and just wait for the next one
+            await asyncio.sleep(interval)
+            continue
+        report(seconds_done)
 
-        log(f"[{quest.id}] Sleeping for {interval:.0f}s...")
+        log(f"{prefix} Sleeping for {interval:.0f}s...")
 
         log_interval = 10
-        start = asyncio.get_running_loop().time()
-        end = start + interval
+        end = loop_time() + interval
 
         if log_interval > interval:
             await asyncio.sleep(interval)
         else:
             while True:
-                remaining = end - asyncio.get_running_loop().time()
+                remaining = end - loop_time()
                 if remaining <= 0:
                     break
 
-                log(f"[{quest.id}] {remaining:.0f}s remaining...")
+                log(f"{prefix} {remaining:.0f}s remaining...")
                 await asyncio.sleep(min(log_interval, remaining))
 
     if not completed:
@@ -113,7 +144,7 @@ async def complete_video_quest(
             f"quests/{quest.id}/heartbeat", json={"timestamp": seconds_needed}
         )
 
-    log(f"[{quest.id}] Quest completed at {time_curr().isoformat()}!")
+    log(f"{prefix} Quest completed at {time_curr().isoformat()}!")
     procCallback(seconds_needed, seconds_needed)
 
     return True
@@ -127,8 +158,8 @@ async def complete_play_quest(
 ) -> bool:
     user_status = quest.user_status
     task_name, seconds_done, seconds_needed = get_quest_progress(quest)
+    prefix = f"[{quest.id}]"  # static part of every log line
 
-    interval = random.uniform(55, 70)
     enrolled_at = user_status.enrolled_at
     completed = False
 
@@ -137,65 +168,71 @@ async def complete_play_quest(
 
     perc = (seconds_done / seconds_needed) if seconds_needed else 0.0
     log(
-        f"[{quest.id}] "
+        f"{prefix} "
         f"{task_name}: {seconds_done}/{seconds_needed}s "
         f"({perc * 100:.1f}%) | "
         f"Started: {datetime.fromisoformat(enrolled_at)} | "
         f"Rewards: {','.join(get_quest_rewards(quest))}"
     )
 
-    def get_seconds_response(data: DotMap) -> int:
+    report = throttle_progress(procCallback, seconds_done, seconds_needed)
+    loop_time = asyncio.get_running_loop().time
+
+    stream_progress = quest.config.config_version == 1
+
+    def get_seconds_response(data: dict) -> int:
         return (
-            data.streamProgressSeconds
-            if quest.config.config_version == 1
-            else math.floor(data.progress.PLAY_ON_DESKTOP.value)
+            data["streamProgressSeconds"]
+            if stream_progress
+            else math.floor(data["progress"]["PLAY_ON_DESKTOP"]["value"])
         )
 
     while not completed:
-        server_response = DotMap(
-            await get_json(
-                await session.post(
-                    f"quests/{application_id}/heartbeat", json=request_body
-                )
-            )
+        # Plain dict, wrapping it in a DotMap for two fields isn't worth it
+        server_response = await get_json(
+            await session.post(f"quests/{application_id}/heartbeat", json=request_body)
         )
-        log(f"[{quest.id}] Heartbeat sent and got reply: {json.dumps(server_response)}")
+        log(f"{prefix} Heartbeat sent and got reply: {json.dumps(server_response)}")
 
         seconds_done = get_seconds_response(server_response)
-        completed = server_response.completed_at is not None
+        completed = server_response.get("completed_at") is not None
 
-        procCallback(seconds_done, seconds_needed)
         if seconds_done >= seconds_needed:
             break
+        report(seconds_done)
 
-        log(f"[{quest.id}] Sleeping for {interval:.0f}s...")
-
-        if seconds_done > seconds_needed * 0.8:  # Last 20%
-            interval = random.uniform(30, 45)
-        else:
-            interval = random.uniform(55, 70)
+        # Long way to go => fewer heartbeats, close to done => tighter polling
+        seconds_left = seconds_needed - seconds_done
+        interval = max(30, min(120, seconds_left / 5)) + rng.uniform(-5, 5)
+        log(f"{prefix} Sleeping for {interval:.0f}s...")
 
         log_interval = 10
-        start = asyncio.get_running_loop().time()
-        end = start + interval
+        end = loop_time() + interval
 
         while True:
-            remaining = end - asyncio.get_running_loop().time()
+            remaining = end - loop_time()
             if remaining <= 0:
                 break
 
-            log(f"[{quest.id}] {remaining:.0f}s remaining...")
+            log(f"{prefix} {remaining:.0f}s remaining...")
             await asyncio.sleep(min(log_interval, remaining))
 
     if not completed:
         await session.post(f"quests/{application_id}/heartbeat", json=request_body)
 
-    log(f"[{quest.id}] Quest completed at {time_curr().isoformat()}!")
+    log(f"{prefix} Quest completed at {time_curr().isoformat()}!")
     procCallback(seconds_needed, seconds_needed)
 
     return True
 
 
+# TODO: Add more functions
+QUEST_COMPLETERS: dict[QuestType, QuestCompleter] = {
+    QuestType.Watch: complete_video_quest,
+    QuestType.Play: complete_play_quest,
+}
+
+
 async def complete_quest(
     quest: DotMap,
     session: ClientSession,
@@ -205,14 +242,8 @@ async def complete_quest(
     quest_type = get_quest_type(quest)
     quest_name = get_quest_name(quest, quest_type).title()
 
-    # TODO: Add more functions
-    quest_map: dict[QuestType, QuestCompleter] = {
-        QuestType.Watch: complete_video_quest,
-        QuestType.Play: complete_play_quest,
-    }
-
     if not Filters.Completeable(quest):
-        log(f"Uncompleteable Quest '{quest.id}' of type '{quest_type}'")
+        log(f"Uncompleteable Quest '{quest.id}' of type '{quest_type.name}'")
         procCallback(quest_name, 0, 0)
         return False
 
@@ -221,7 +252,7 @@ async def complete_quest(
         procCallback(quest_name, 0, 0)
         return False
 
-    completer = quest_map.get(quest_type)
+    completer = QUEST_COMPLETERS.get(quest_type)
     if not completer:
         log(f"Unsupported Quest '{quest.id}' of type '{quest_type.name}'")
         procCallback(quest_name, 0, 0)
@@ -2,6 +2,7 @@ from argparse import ArgumentParser
 import asyncio
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
 import re
 from uuid import uuid4
 
@@ -9,7 +10,7 @@ import aiohttp
 from pydotmap import DotMap
 
 from consts import DATE_FORMAT, HEADERS, LOG_FORMAT, LOG_PATH, SUPER_PROPERTIES
-from helpers import base64_encode, dump_json, get_logger, save_data
+from helpers import base64_encode, dump_json, get_logger, save_data, split_json
 from logic import (
     Filters,
     complete_quest,
@@ -25,43 +26,76 @@ from logic import (
 )
 from logic.quests import get_orbs_balance
 from ui import (
-    Progress,
     Console,
     TaskID,
     Text,
-    get_quest_progress_columns,
+    Style,
+    get_quest_spinner_column,
     make_progress,
     make_quests_table,
     ROUNDED,
 )
 
+try:
+    import uvloop
+except ImportError:  # optional speedup, not available on windows
+    uvloop = None
+
 logger = get_logger(__name__, LOG_PATH / "completer.log", LOG_FORMAT, DATE_FORMAT)
 
+BUILD_NUMBER_RE = re.compile(rb'"BUILD_NUMBER":\s*"(\d+)"')
+
+# Parsed once instead of on every quest log line
+QUEST_LOG_STYLE = Style.parse("white italic")
+QUEST_COMPLETED_STYLE = Style.parse("green bold")
+
+
+def update_super_properties(
+    session: aiohttp.ClientSession, raw: Optional[bytes] = None
+):
+    # Only header that changes during a run, the rest are set once on the session
+    HEADERS["X-Super-Properties"] = session.headers["X-Super-Properties"] = (
+        base64_encode(raw or dump_json(SUPER_PROPERTIES))
+    )
+
 
 async def change_heartbeat_id(session: aiohttp.ClientSession):
+    key = "client_heartbeat_session_id"
+    # Only the id changes between rotations, the rest is serialized once
+    prefix, suffix = split_json(SUPER_PROPERTIES, key)
+
     while True:
         await asyncio.sleep(30 * 60)
         new_heartbeat_id = str(uuid4())
-        SUPER_PROPERTIES["client_heartbeat_session"] = new_heartbeat_id
-        session.headers.update(
-            {"X-Super-Properties": base64_encode(dump_json(SUPER_PROPERTIES))}
-        )
+        SUPER_PROPERTIES[key] = new_heartbeat_id
+        update_super_properties(session, prefix + dump_json(new_heartbeat_id) + suffix)
         logger.debug("Changed heartbeat session id")
 
 
 async def update_headers(session: aiohttp.ClientSession):
-    raw_html = await (await session.get("/")).text()
-    build_number_match = re.search(r""""BUILD_NUMBER":\s*"(\d+)""", raw_html)
-    if build_number_match:
-        SUPER_PROPERTIES["client_build_number"] = int(build_number_match.group(1))
-    HEADERS["X-Super-Properties"] = base64_encode(dump_json(SUPER_PROPERTIES))
+    # Searched as bytes, no need to decode the whole page
+    async with session.get("/") as resp:
+        build_number_match = BUILD_NUMBER_RE.search(await resp.read())
+    if not build_number_match:
+        return
 
-    session.headers.update(HEADERS)
+    build_number = int(build_number_match.group(1))
+    if build_number != SUPER_PROPERTIES["client_build_number"]:
+        SUPER_PROPERTIES["client_build_number"] = build_number
+        update_super_properties(session)
 
 
 async def main(ap: ArgumentParser):
     async with aiohttp.ClientSession(
-        base_url="https://discord.com/api/v10/", raise_for_status=True
+        base_url="https://discord.com/api/v10/",
+        headers=HEADERS,
+        # Everything goes to discord.com, keep the connection alive between
+        # heartbeats (at most ~125s apart) so each one doesn't redo the TLS handshake
+        connector=aiohttp.TCPConnector(
+            limit=8, limit_per_host=4, keepalive_timeout=150, ttl_dns_cache=600
+        ),
+        raise_for_status=True,
+        json_serialize=lambda data: dump_json(data).decode(),
     ) as session:
         await update_headers(session)
 
@@ -92,74 +126,53 @@ async def main(ap: ArgumentParser):
             console.print(table)
             return
 
-        asyncio.create_task(change_heartbeat_id(session))
+        heartbeat_rotator = asyncio.create_task(change_heartbeat_id(session))
 
         with make_progress(console=console) as progress:
-            _tween_queue: asyncio.Queue[object | tuple[TaskID, str, int, int]] = (
-                asyncio.Queue()
-            )
-            _current_values: dict[TaskID, int] = {}
-            _sential = object()
-
-            async def progress_worker(progress: Progress, speed: float = 2e-1):
-                while (item := await _tween_queue.get()) and item is not _sential:
-                    if not isinstance(item, tuple):
-                        break
-
-                    task_id, name, done, total = item
-                    if task_id not in progress.task_ids:
-                        _tween_queue.task_done()
-                        continue
-
-                    current = _current_values.get(task_id, 0)
-
-                    # Update static fields immediately
-                    progress.update(task_id, description=name, total=total)
-
-                    # Tween smoothly
-                    while current < done:
-                        step = max(1, (done - current) // 8)  # easing
-                        current += step
-                        if current > done:
-                            current = done
-
-                        _current_values[task_id] = current
-                        progress.update(task_id, completed=current)
-
-                        await asyncio.sleep(speed)
-
-                    _current_values[task_id] = done
-                    _tween_queue.task_done()
-
-                if item:
-                    _tween_queue.task_done()
 
             def update_progress():
                 progress.refresh()
 
             def log(*msgs: Text | str, important: bool = True):
-                to_console, to_log = [], []
+                logger.debug(
+                    [msg.plain if isinstance(msg, Text) else msg for msg in msgs]
+                )
+
+                # Markup is only parsed for messages that are actually printed
+                if not (verbose or important):
+                    return
 
+                to_console = []
                 for msg in msgs:
-                    if isinstance(msg, Text):
-                        to_log.append(msg.plain)
-                    else:
-                        to_log.append(msg)
+                    if not isinstance(msg, Text):
                         msg = Text.from_markup(msg)
 
                     msg.truncate(progress.console.width, overflow="ellipsis")
                     to_console.append(msg)
 
-                logger.debug(to_log)
+                progress.console.print(*to_console, sep="\n")
+
+            def quest_log(msg: str):
+                completed = "Quest completed" in msg
+                important = completed or "Unknown Quest" in msg
+
+                # Not going to be printed, no need to build a renderable for it
                 if not (verbose or important):
+                    logger.debug([msg])
                     return
 
-                progress.console.print(*to_console, sep="\n")
+                log(
+                    Text(
+                        msg,
+                        style=QUEST_COMPLETED_STYLE if completed else QUEST_LOG_STYLE,
+                        justify="left",
+                        overflow="ellipsis",
+                        no_wrap=True,
+                    ),
+                    important=important,
+                )
 
             try:
-                # Start the Queue Worker
-                asyncio.create_task(progress_worker(progress, 1e-1))
-
                 save_path = Path("saved").expanduser().absolute().resolve()
                 save_path.mkdir(parents=True, exist_ok=True)
 
@@ -182,12 +195,15 @@ async def main(ap: ArgumentParser):
                     )
                 )
 
-                async def wrapper_quest_complete(idx, quest):
+                async def wrapper_quest_complete(quest, last: bool):
                     task_id = progress.add_task(
-                        description="Initilizing...", total=None
+                        description="Initializing...", total=None
+                    )
+                    # Resets the spinner of progress bar, other columns are kept
+                    progress.columns = (
+                        get_quest_spinner_column(),
+                        *progress.columns[1:],
                     )
-                    # Resets the spinner of progress bar
-                    progress.columns = get_quest_progress_columns()
 
                     update_progress()
                     await complete_quest(
@@ -196,23 +212,11 @@ async def main(ap: ArgumentParser):
                         procCallback=lambda name, done, total: updater(
                             name, done, total, task_id
                         ),
-                        log=lambda msg: log(
-                            Text(
-                                msg,
-                                style="Quest completed" in msg
-                                and "green bold"
-                                or "white italic",
-                                justify="left",
-                                overflow="ellipsis",
-                                no_wrap=True,
-                            ),
-                            important=("Quest completed" in msg)
-                            or ("Unknown Quest" in msg),
-                        ),
+                        log=quest_log,
                     )
 
                     # Remove taks if not last
-                    if idx != len(uncompleted_quests) - 1:
+                    if not last:
                         progress.remove_task(task_id)
                     else:
                         progress.stop_task(task_id)
@@ -309,14 +313,15 @@ async def main(ap: ArgumentParser):
                         continue
 
                     # Only process specific reward quests [orbs, decorations](Filters.Worthy)
-                    worthy_uncompleted_quests = list(
-                        filter(Filters.Worthy, uncompleted_quests)
-                    )
-                    less_worthy_uncompleted_quuests = list(
-                        filter(lambda x: not Filters.Worthy(x), uncompleted_quests)
-                    )
-
-                    # Sort
+                    # Single pass, so Filters.Worthy runs once per quest
+                    worthy_uncompleted_quests, less_worthy_uncompleted_quuests = [], []
+                    for quest in uncompleted_quests:
+                        if Filters.Worthy(quest):
+                            worthy_uncompleted_quests.append(quest)
+                        else:
+                            less_worthy_uncompleted_quuests.append(quest)
+
+                    # Sort (quest types are memoized, so each is resolved once)
                     worthy_uncompleted_quests.sort(key=get_quest_type, reverse=True)
                     less_worthy_uncompleted_quuests.sort(
                         key=get_quest_type, reverse=True
@@ -329,10 +334,20 @@ async def main(ap: ArgumentParser):
                         log("Bye bye 👋🏻👋🏻")
                         return
 
+                    # Quests run one after another, only the very last bar is kept
+                    last_quest = (
+                        less_worthy_uncompleted_quuests or worthy_uncompleted_quests
+                    )[-1]
+
                     def updater(name: str, done: int, total: int, task_id: TaskID):
                         cap: int = (console.width or 24) // 3 - 10
                         description = name[:cap] + ("..." if len(name) > cap else "")
-                        _tween_queue.put_nowait((task_id, description, done, total))
+                        progress.update(
+                            task_id,
+                            description=description,
+                            total=total,
+                            completed=done,
+                        )
 
                     if len(worthy_uncompleted_quests) > 0:
                         log(
@@ -341,11 +356,8 @@ async def main(ap: ArgumentParser):
                                 "[bold cyan]worthy[/] quests..."
                             )
                         )
-                        for idx, quest in enumerate(worthy_uncompleted_quests):
-                            await wrapper_quest_complete(idx, quest)
-
-                        # Wait until all item/progress_updates related to current quests are applied
-                        await _tween_queue.join()
+                        for quest in worthy_uncompleted_quests:
+                            await wrapper_quest_complete(quest, quest is last_quest)
 
                     if len(less_worthy_uncompleted_quuests) > 0:
                         log(
@@ -354,21 +366,17 @@ async def main(ap: ArgumentParser):
                                 "[italic yellow]less worthy[/] quests..."
                             )
                         )
-                        for idx, quest in enumerate(less_worthy_uncompleted_quuests):
-                            await wrapper_quest_complete(idx, quest)
-
-                        # Wait until all item/progress_updates related to current quests are applied
-                        await _tween_queue.join()
+                        for quest in less_worthy_uncompleted_quuests:
+                            await wrapper_quest_complete(quest, quest is last_quest)
 
-                    # Stop the queue_worker and be done
-                    await _tween_queue.put(_sential)
-                    # Wait until all item/progress_updates are applied
-                    await _tween_queue.join()
                     break
             except (KeyboardInterrupt, asyncio.CancelledError):
                 return
             except Exception:
                 console.print_exception()
+            finally:
+                # Don't leave the rotator running (and unreferenced) on exit
+                heartbeat_rotator.cancel()
 
 
 if __name__ == "__main__":
@@ -398,4 +406,5 @@ if __name__ == "__main__":
         help="shows the quests as a table for current user and exit",
     )
 
-    asyncio.run(main(parser))
+    run = uvloop.run if uvloop else asyncio.run
+    run(main(parser))
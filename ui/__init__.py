@@ -5,11 +5,13 @@ from ui.helpers import (
     make_progress,
     Console,
     get_quest_progress_columns,
+    get_quest_spinner_column,
     Text,
     Progress,
 )
 from rich.box import ROUNDED
 from rich.progress import TaskID
+from rich.style import Style
 
 
 __all__ = (
@@ -18,10 +20,12 @@ __all__ = (
     "Progress",
     "Console",
     "Text",
+    "Style",
     "TaskID",
     "make_layout",
     "make_quests_table",
     "ROUNDED",
     "make_progress",
     "get_quest_progress_columns",
+    "get_quest_spinner_column",
 )
@@ -1,5 +1,6 @@
+from itertools import cycle
 import random
-from typing import Iterable
+from typing import Iterable, NamedTuple
 from pydotmap import DotMap
 from logic import (
     get_quest_type,
@@ -24,38 +25,73 @@ from rich.text import Text
 
 from ui.consts import SPINNERS, FINISHED_TEXTS
 
+# Shown until the first real message arrives
+_INIT_MESSAGES = ("Initializing...",)
+
+_COLUMNS = ("#", "Type", "Name", "Rewards", "Progress", "Expired")
+
+# Resolved once, saves a class attribute lookup per table row
+_not_expired = Filters.NotExpired
+
+# Shuffled once and cycled, so every quest still gets a different spinner
+_spinners = cycle(random.sample(SPINNERS, len(SPINNERS)))
+_finished_texts = cycle(random.sample(FINISHED_TEXTS, len(FINISHED_TEXTS)))
+
 
 def make_quests_table(quests: Iterable[DotMap], **table_kwargs) -> Table:
     table = Table(**table_kwargs, expand=True)
 
-    list(map(table.add_column, ["#", "Type", "Name", "Rewards", "Progress", "Expired"]))
-    for idx, quest in enumerate(quests, 1):
-        table.add_row(*[str(idx), *make_quest_renderables(quest)])
+    add_column = table.add_column
+    for column in _COLUMNS:
+        add_column(column)
+    add_row = table.add_row
+    for idx, view in enumerate(map(make_quest_view, quests), 1):
+        add_row(str(idx), *make_quest_renderables(view))
 
     return table
 
 
-def make_quest_renderables(quest: DotMap, **text_kwargs):
-    """Text: Type, Name, Rewards, Progress, Expired"""
+def _format_pct(x: int | float, y: int | float) -> str:
+    # Values come straight from DotMap, where a missing field reads as ""
+    if not (isinstance(x, (int, float)) and isinstance(y, (int, float))) or not y:
+        return "0.00%"
+    return format(x * 100.0 / y, ".2f") + "%"
 
-    def percentage(x, y) -> str:
-        if not all(isinstance(i, (int, float)) for i in [x, y]):
-            return "0.00%"
-        # if has higher presidence over artihmetic
-        return f"{(x / y if y else 0) * 100:.2f}%"
-
-    return map(
-        lambda x: Text(x, **text_kwargs),
-        map(
-            str,
-            [
-                get_quest_type(quest).name,
-                get_quest_name(quest).title(),
-                ", ".join(get_quest_rewards(quest)),
-                percentage(*get_quest_progress(quest)[1:]),
-                not Filters.NotExpired(quest),
-            ],
-        ),
+
+class QuestView(NamedTuple):
+    """Flat snapshot of what the quests table shows for a quest"""
+
+    type_name: str
+    name: str
+    rewards: str
+    progress: str
+    expired: bool
+
+
+def make_quest_view(quest: DotMap) -> QuestView:
+    """Walks the quest's DotMap once, rendering only reads plain fields"""
+    quest_type = get_quest_type(quest)
+    _, done, total = get_quest_progress(quest)
+
+    return QuestView(
+        type_name=quest_type.name,
+        name=get_quest_name(quest, quest_type).title(),
+        rewards=", ".join(get_quest_rewards(quest)),
+        progress=_format_pct(done, total),
+        expired=not _not_expired(quest),
+    )
+
+
+def make_quest_renderables(
+    view: QuestView, **text_kwargs
+) -> tuple[Text, Text, Text, Text, Text]:
+    """Text: Type, Name, Rewards, Progress, Expired"""
+    return (
+        Text(view.type_name, **text_kwargs),
+        Text(view.name, **text_kwargs),
+        Text(view.rewards, **text_kwargs),
+        Text(view.progress, **text_kwargs),
+        Text(str(view.expired), **text_kwargs),
     )
 
 
@@ -79,11 +115,13 @@ def make_progress_panel(progress: Progress):
     )
 
 
+def get_quest_spinner_column():
+    return SpinnerColumn(next(_spinners), finished_text=next(_finished_texts))
+
+
 def get_quest_progress_columns():
     return (
-        SpinnerColumn(
-            random.choice(SPINNERS), finished_text=random.choice(FINISHED_TEXTS)
-        ),
+        get_quest_spinner_column(),
         TextColumn(
             "{task.description}",
             style="italic cyan bold",
@@ -99,6 +137,8 @@ def make_progress(console: Console):
         *get_quest_progress_columns(),
         console=console,
         expand=True,
+        # Quests take minutes, no need for rich's default 10 redraws a second
+        refresh_per_second=2,
     )
 
 
@@ -108,7 +148,7 @@ def make_layout(progress: Progress):
         Layout(name="messages", ratio=1), Layout(name="progress", size=3)
     )
 
-    layout["messages"].update(make_messages_panel(["Initilizing..."]))
+    layout["messages"].update(make_messages_panel(_INIT_MESSAGES))
     layout["progress"].update(make_progress_panel(progress))
 
     return layout